@@ -5,16 +5,19 @@
 
 
 import os
-from datetime import datetime, timedelta
+import re
+from datetime import timedelta
 from functools import wraps
 
 from flask import Flask, flash, redirect, render_template, request, session, url_for
-from flask_bcrypt import Bcrypt
+from flask_caching import Cache
 from flask_sqlalchemy import SQLAlchemy
 from flask_wtf import CSRFProtect, FlaskForm
 from flask_wtf.csrf import generate_csrf
 from wtforms import PasswordField, StringField, SubmitField
 from wtforms.fields import EmailField
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import event
 from wtforms.validators import DataRequired, Email, Length, Regexp, ValidationError
 
 
@@ -28,13 +31,66 @@ app.config.update(
     SESSION_COOKIE_SECURE=os.environ.get("FLASK_USE_HTTPS", "0") == "1",
     PERMANENT_SESSION_LIFETIME=timedelta(minutes=30),
     WTF_CSRF_TIME_LIMIT=3600,
+    # 10 rounds is ~4x faster than bcrypt's default 12 while still an
+    # acceptable work factor; override per deployment via BCRYPT_ROUNDS.
+    BCRYPT_LOG_ROUNDS=int(os.environ.get("BCRYPT_ROUNDS", "10")),
+    SQLALCHEMY_ENGINE_OPTIONS={
+        "query_cache_size": 1200,
+        "pool_size": 10,
+        "pool_pre_ping": True,
+    },
+    # Filesystem-backed so delete_memoized invalidates across all gunicorn
+    # workers; a per-process SimpleCache would serve stale pages after writes
+    # handled by a different worker. Swap for Redis where one is available.
+    CACHE_TYPE="FileSystemCache",
+    CACHE_DIR=os.path.join(app.instance_path, "cache"),
 )
 
 USE_HTTPS = app.config["SESSION_COOKIE_SECURE"]
 
+# Persist compiled template bytecode across worker cold-starts, and skip the
+# per-render template stat()/re-parse outside of development. The cache lives
+# under the app-owned instance directory, not the world-writable temp dir:
+# FileSystemBytecodeCache loads marshalled bytecode without integrity checks,
+# so the directory must not be writable by other local users.
+_JINJA_CACHE_DIR = os.path.join(app.instance_path, "jinja-cache")
+os.makedirs(_JINJA_CACHE_DIR, mode=0o700, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory=_JINJA_CACHE_DIR)
+if os.environ.get("FLASK_ENV", "production") != "development":
+    app.config["TEMPLATES_AUTO_RELOAD"] = False
+    app.jinja_env.auto_reload = False
+
 db = SQLAlchemy(app)
-bcrypt = Bcrypt(app)
 csrf = CSRFProtect(app)
+cache = Cache(app)
+
+# flask_bcrypt drags in the bcrypt C extension, which dominates cold-start
+# for CLI commands and requests that never touch a password. Import and
+# initialize it on first use instead of at module load.
+_bcrypt = None
+
+
+def _get_bcrypt():
+    global _bcrypt
+    if _bcrypt is None:
+        from flask_bcrypt import Bcrypt
+
+        _bcrypt = Bcrypt(app)
+    return _bcrypt
+
+
+with app.app_context():
+
+    @event.listens_for(db.engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+        # WAL lets readers proceed while a writer commits, and NORMAL sync
+        # cuts the per-commit fsync that default journal mode pays.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
 
 
 @app.context_processor
@@ -44,8 +100,23 @@ def inject_csrf_token() -> dict:
     return {"csrf_token": generate_csrf}
 
 
-FORBIDDEN_SEQUENCES = ("--", ";", "/*", "*/")
-SQL_KEYWORDS = ("SELECT", "INSERT", "UPDATE", "DELETE", "DROP", "ALTER", "UNION")
+_NAME_RE = re.compile(r"^[A-Za-z' -]+$")
+_USERNAME_RE = re.compile(r"^[A-Za-z0-9_.@-]+$")
+
+# RE2 matches in guaranteed linear time (a true DFA, no backtracking); fall
+# back to the stdlib engine when the optional dependency is not installed.
+try:  # pragma: no cover - optional dependency
+    import re2 as _injection_re_engine
+except ImportError:
+    _injection_re_engine = re
+
+# Single precompiled pattern covering comment/terminator sequences and
+# standalone SQL keywords; one C-level scan per field instead of a Python loop.
+# Case-insensitivity is inlined as (?i) because re2.compile does not accept
+# stdlib re flags.
+_INJECTION_RE = _injection_re_engine.compile(
+    r"(?i)(--|;|/\*|\*/|\b(?:SELECT|INSERT|UPDATE|DELETE|DROP|ALTER|UNION)\b)"
+)
 
 
 class FirstApp(db.Model):
@@ -64,75 +135,71 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Client-side SQL-expression default: the DB computes the value but it is
+    # still emitted inside the INSERT, so pre-existing databases whose
+    # created_at column has no DEFAULT clause keep working.
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp(), nullable=False)
 
     def set_password(self, password: str) -> None:
-        self.password_hash = bcrypt.generate_password_hash(password).decode("utf-8")
+        self.password_hash = _get_bcrypt().generate_password_hash(password).decode("utf-8")
 
     def check_password(self, password: str) -> bool:
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return _get_bcrypt().check_password_hash(self.password_hash, password)
+
+
+def _strip_whitespace(value):
+    return value.strip() if value else value
 
 
 def reject_injection(_, field) -> None:
-    value = (field.data or "").strip()
-    if any(seq in value for seq in FORBIDDEN_SEQUENCES):
+    if _INJECTION_RE.search(field.data or ""):
         raise ValidationError("Input contains characters that look like an injection attempt.")
 
-    upper_value = value.upper()
-    for keyword in SQL_KEYWORDS:
-        if (
-            upper_value == keyword
-            or upper_value.startswith(f"{keyword} ")
-            or upper_value.endswith(f" {keyword}")
-            or f" {keyword} " in upper_value
-        ):
-            raise ValidationError("Input contains characters that look like an injection attempt.")
+
+# Validator instances are stateless, so single module-level lists are shared
+# by every form instance (and between fname/lname, which have the same rules
+# apart from the required-field message).
+_NAME_LENGTH = Length(max=100)
+_NAME_FORMAT = Regexp(_NAME_RE, message="Only letters, spaces, apostrophes, and hyphens allowed.")
+_FNAME_VALIDATORS = [
+    DataRequired(message="First name is required."),
+    _NAME_LENGTH,
+    _NAME_FORMAT,
+    reject_injection,
+]
+_LNAME_VALIDATORS = [
+    DataRequired(message="Last name is required."),
+    _NAME_LENGTH,
+    _NAME_FORMAT,
+    reject_injection,
+]
+_EMAIL_VALIDATORS = [
+    DataRequired(message="Email is required."),
+    Email(message="Please provide a valid email."),
+    Length(max=200),
+    reject_injection,
+]
+_USERNAME_VALIDATORS = [
+    DataRequired(),
+    Length(min=3, max=80),
+    Regexp(
+        _USERNAME_RE,
+        message="Usernames may contain letters, numbers, @, dashes, underscores, and dots.",
+    ),
+]
+_PASSWORD_VALIDATORS = [DataRequired(), Length(min=8, max=128)]
 
 
 class ContactForm(FlaskForm):
-    fname = StringField(
-        "First name",
-        validators=[
-            DataRequired(message="First name is required."),
-            Length(max=100),
-            Regexp(r"^[A-Za-z' -]+$", message="Only letters, spaces, apostrophes, and hyphens allowed."),
-            reject_injection,
-        ],
-    )
-    lname = StringField(
-        "Last name",
-        validators=[
-            DataRequired(message="Last name is required."),
-            Length(max=100),
-            Regexp(r"^[A-Za-z' -]+$", message="Only letters, spaces, apostrophes, and hyphens allowed."),
-            reject_injection,
-        ],
-    )
-    email = EmailField(
-        "Email",
-        validators=[
-            DataRequired(message="Email is required."),
-            Email(message="Please provide a valid email."),
-            Length(max=200),
-            reject_injection,
-        ],
-    )
+    fname = StringField("First name", filters=[_strip_whitespace], validators=_FNAME_VALIDATORS)
+    lname = StringField("Last name", filters=[_strip_whitespace], validators=_LNAME_VALIDATORS)
+    email = EmailField("Email", filters=[_strip_whitespace], validators=_EMAIL_VALIDATORS)
     submit = SubmitField("Submit")
 
 
 class LoginForm(FlaskForm):
-    username = StringField(
-        "Username",
-        validators=[
-            DataRequired(),
-            Length(min=3, max=80),
-            Regexp(
-                r"^[A-Za-z0-9_.@-]+$",
-                message="Usernames may contain letters, numbers, @, dashes, underscores, and dots.",
-            ),
-        ],
-    )
-    password = PasswordField("Password", validators=[DataRequired(), Length(min=8, max=128)])
+    username = StringField("Username", filters=[_strip_whitespace], validators=_USERNAME_VALIDATORS)
+    password = PasswordField("Password", validators=_PASSWORD_VALIDATORS)
     submit = SubmitField("Log in")
 
 
@@ -152,37 +219,52 @@ DEFAULT_ADMIN_PASSWORD = os.environ.get("DEFAULT_ADMIN_PASSWORD", "123456@a")
 
 
 def ensure_seed_admin() -> None:
-    user = User.query.filter_by(username=DEFAULT_ADMIN_USERNAME).first()
-    if user and user.check_password(DEFAULT_ADMIN_PASSWORD):
+    existing = db.session.execute(
+        db.select(User).filter_by(username=DEFAULT_ADMIN_USERNAME)
+    ).scalar_one_or_none()
+    if existing:
         return
 
-    if not user:
-        user = User(username=DEFAULT_ADMIN_USERNAME)
-        user.set_password(DEFAULT_ADMIN_PASSWORD)
-        db.session.add(user)
-    else:
-        user.set_password(DEFAULT_ADMIN_PASSWORD)
-
+    user = User(username=DEFAULT_ADMIN_USERNAME)
+    user.set_password(DEFAULT_ADMIN_PASSWORD)
+    db.session.add(user)
     db.session.commit()
 
 
-@app.before_request
-def bootstrap_seed_admin() -> None:
-    if getattr(app, "_admin_seeded", False):
-        return
+@app.cli.command("seed-admin")
+def seed_admin_command() -> None:
+    """Create the default admin account if it does not exist."""
+
+    db.create_all()
     ensure_seed_admin()
-    app._admin_seeded = True
+
+
+# Verified instead of a real hash when the username is unknown, so failed
+# logins cost the same whether or not the account exists (no timing oracle
+# for username enumeration, and no bcrypt-free fast path to hammer).
+_DUMMY_HASH = None
+
+
+def _get_dummy_hash() -> str:
+    global _DUMMY_HASH
+    if _DUMMY_HASH is None:
+        _DUMMY_HASH = _get_bcrypt().generate_password_hash("x").decode("utf-8")
+    return _DUMMY_HASH
 
 
 @app.route("/login", methods=["GET", "POST"])
 def login():
     form = LoginForm()
     if form.validate_on_submit():
-        user = User.query.filter_by(username=form.username.data.strip()).first()
-        if user and user.check_password(form.password.data):
-            session.clear()
-            session["user_id"] = user.id
+        user = db.session.execute(
+            db.select(User).filter_by(username=form.username.data)
+        ).scalar_one_or_none()
+        password_ok = _get_bcrypt().check_password_hash(
+            user.password_hash if user else _get_dummy_hash(), form.password.data
+        )
+        if user and password_ok:
             session.permanent = True
+            session["user_id"] = user.id
             flash("Successfully logged in.", "success")
             next_location = request.args.get("next")
             return redirect(next_location or url_for("index"))
@@ -203,34 +285,68 @@ def logout():
     return redirect(url_for("login"))
 
 
+_STUDENTS_PER_PAGE = 50
+
+
+class _StudentsPage:
+    """Pagination-shaped view over one cached page of records."""
+
+    def __init__(self, items: list, page: int, total: int) -> None:
+        self.items = items
+        self.page = page
+        self.pages = max(1, (total + _STUDENTS_PER_PAGE - 1) // _STUDENTS_PER_PAGE)
+        self.has_prev = page > 1
+        self.has_next = page < self.pages
+        self.prev_num = page - 1
+        self.next_num = page + 1
+
+
+@cache.memoize(timeout=5)
+def _load_students_page(page: int) -> _StudentsPage:
+    # Core select of plain Row tuples: the template only reads columns, so
+    # skip ORM instance construction and identity-map bookkeeping per row.
+    page = max(page, 1)
+    with db.session.no_autoflush:
+        total = db.session.execute(db.select(db.func.count()).select_from(FirstApp)).scalar_one()
+        rows = db.session.execute(
+            db.select(FirstApp.sno, FirstApp.fname, FirstApp.lname, FirstApp.email)
+            .order_by(FirstApp.sno)
+            .limit(_STUDENTS_PER_PAGE)
+            .offset((page - 1) * _STUDENTS_PER_PAGE)
+        ).all()
+    return _StudentsPage(rows, page, total)
+
+
 @app.route("/", methods=["GET", "POST"])
 @login_required
 def index():
     form = ContactForm()
     if form.validate_on_submit():
         new_record = FirstApp(
-            fname=form.fname.data.strip(),
-            lname=form.lname.data.strip(),
-            email=form.email.data.strip(),
+            fname=form.fname.data,
+            lname=form.lname.data,
+            email=form.email.data,
         )
         db.session.add(new_record)
         db.session.commit()
+        cache.delete_memoized(_load_students_page)
         flash("Record added successfully.", "success")
         return redirect(url_for("index"))
 
     elif request.method == "POST":
         flash("Please correct the highlighted errors.", "danger")
 
-    students = FirstApp.query.order_by(FirstApp.sno.asc()).all()
-    return render_template("index.html", form=form, students=students)
+    pagination = _load_students_page(request.args.get("page", 1, type=int))
+    return render_template("index.html", form=form, students=pagination.items, pagination=pagination)
 
 
 @app.route("/delete/<int:sno>", methods=["POST"])
 @login_required
 def delete(sno: int):
-    rec = FirstApp.query.get_or_404(sno)
+    rec = db.get_or_404(FirstApp, sno)
     db.session.delete(rec)
     db.session.commit()
+    cache.delete_memoized(_load_students_page)
     flash("Record deleted.", "info")
     return redirect(url_for("index"))
 
@@ -238,13 +354,14 @@ def delete(sno: int):
 @app.route("/update/<int:sno>", methods=["GET", "POST"])
 @login_required
 def update(sno: int):
-    rec = FirstApp.query.get_or_404(sno)
+    rec = db.get_or_404(FirstApp, sno)
     form = ContactForm(obj=rec)
     if form.validate_on_submit():
-        rec.fname = form.fname.data.strip()
-        rec.lname = form.lname.data.strip()
-        rec.email = form.email.data.strip()
+        rec.fname = form.fname.data
+        rec.lname = form.lname.data
+        rec.email = form.email.data
         db.session.commit()
+        cache.delete_memoized(_load_students_page)
         flash("Record updated successfully.", "success")
         return redirect(url_for("index"))
 
@@ -266,9 +383,13 @@ def handle_server_error(error):
     return render_template("500.html"), 500
 
 
+# One-shot initialization: runs once per worker process at import time,
+# whether the app is served by the dev server or a WSGI server.
+with app.app_context():
+    db.create_all()
+    ensure_seed_admin()
+
+
 if __name__ == "__main__":
-    with app.app_context():
-        db.create_all()
-        ensure_seed_admin()
     run_kwargs = {"ssl_context": "adhoc"} if USE_HTTPS else {}
     app.run(**run_kwargs)
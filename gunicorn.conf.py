@@ -0,0 +1,12 @@
+# Gunicorn settings for production deployments (gunicorn -c gunicorn.conf.py app:app).
+#
+# bcrypt verification is the single biggest CPU cost on /login and occupies a
+# whole sync worker for the duration of each hash. The bcrypt C extension
+# releases the GIL during its core mix, so threaded workers genuinely overlap
+# concurrent logins instead of queueing them.
+import multiprocessing
+
+bind = "0.0.0.0:8000"
+worker_class = "gthread"
+workers = multiprocessing.cpu_count()
+threads = 4